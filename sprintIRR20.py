@@ -6,6 +6,40 @@ import arguments_values_helpers as hp
 import machine
 import math
 from machine import UART
+from micropython import const
+
+# Compile-time switches for the verbose output. The verbose and verbose_measuring constructor arguments only
+# take effect while these are 1; setting them to 0 before installing the module lets the bytecode
+# compiler skip those checks entirely, which saves an attribute load per command in production
+_VERBOSE = const(1) # const() only accepts integers on older ports
+_VERBOSE_MEASURING = const(1)
+
+# Calibration pressure of the sensor, in mbar
+_CALIBRATION_PRESSURE = 1013
+
+# Compensation value units per mbar of pressure difference: 0.14% per mbar, 8192 being no compensation
+_COMPENSATION_PER_MBAR = 0.14 / 100 * 8192
+
+# Coefficients of the >1% correction polynomials, highest degree first, to be evaluated with Horner's scheme
+_C_HI = (2.6661e-16, -1.1146e-12, 1.7397e-9, -1.2556e-6, -9.8754e-4) # value >= 1500
+_C_LO = (2.881e-38, -9.817e-32, 1.304e-25, -8.126e-20, 2.311e-14, -2.195e-9, -1.471e-3) # value < 1500
+
+# Static commands, pre-encoded so they are not converted to bytes on every write
+CMD_GET_FILT = b"Z\r\n"
+CMD_GET_UNFILT = b"z\r\n"
+CMD_GET_FILTER = b"a\r\n"
+CMD_GET_COMP = b"s\r\n"
+CMD_GET_AUTOZERO = b"@ \r\n"
+CMD_AUTOZERO_ON = b"@ 1\r\n"
+CMD_AUTOZERO_OFF = b"@ 0\r\n"
+CMD_FW = b"Y\r\n"
+CMD_SCALING = b".\r\n"
+CMD_ZERO_AIR = b"G\r\n"
+CMD_ZERO_N2 = b"U\r\n"
+CMD_MODES = (b"K 00000\r\n", b"K 00001\r\n", b"K 00002\r\n") # Indexed by mode
+
+# Bytes kept waiting for a frame delimiter in streaming mode before they are discarded (a frame is ~18 bytes)
+_RX_MAX_PENDING = 128
 
 class SprintIRR20_timeout(Exception):
      def __init__(self, message="Timeout error obtained when interacting with SprintIRR20 sensor"):
@@ -27,9 +61,14 @@ class sprintIRR20:
         self.uart = UART(1, baudrate=38400, bits=8, parity=None, stop=1, pins=('P2','P10'), timeout_chars=1200) #1s timeout. Pins(Tx, Rx)
         self.verbose = verbose
         self.verbose_measuring = verbose_measuring
+        self.mode = None # Unknown until switchMode is called
+        self._rx = b"" # Pending bytes of streaming mode frames, see drain_measurements
+        self._last_stream_filtered = -1
+        self._last_stream_unfiltered = -1
+        self._last_stream_ticks = 0 # time.ticks_ms() of the latest parsed frame
 
         time.sleep(1) # This is needed. Otherwise, sensor won't be able to read after reboot
-        if self.verbose:
+        if _VERBOSE and self.verbose:
             print("\nPlease wait for CO2 sensor startup...")
 
         self.timeout = timeout # seconds
@@ -37,10 +76,12 @@ class sprintIRR20:
             self.scalingFactor = self.getScalingFactorMultiplier()
         else:
             self.scalingFactor = scaling_factor
+        self._inv_scaling = 1.0 / self.scalingFactor # Multiplying is cheaper than dividing on every command
         self.compensationValue = self.getPressureAndCompensationValue()
         self.pressure = self.compensationToPressure(self.compensationValue)
+        self._pressure_delta = _CALIBRATION_PRESSURE - self.pressure # Cached for correctMeasurement
         self.digitalFilter = self.getDigitalFilter()
-        if self.verbose:
+        if _VERBOSE and self.verbose:
             print("\n----------- START OF SENSOR START-UP INFORMATION -----------")
             print("SprintIRR20 -> Scaling multiplier factor: ", self.scalingFactor)
             print("SprintIRR20 -> Concentration compensation value: ", self.compensationValue, ", meaning that the sensor is intended to work at ", self.pressure, " mbar of pressure")
@@ -73,47 +114,96 @@ class sprintIRR20:
 
 
     def getCO2Measurement(self, filtered=False, check_correction=True):
-        if filtered:
+        if self.mode == 1: # Streaming mode: use the latest frame already sent by the sensor instead of polling it
+            # Between frames this keeps returning the last value received, -1 if none was received yet
+            self.drain_measurements(filtered)
+            if self.timeout != 0 and time.ticks_diff(time.ticks_ms(), self._last_stream_ticks) > self.timeout * 1000:
+                raise SprintIRR20_timeout() # Sensor stopped streaming
+            value = self._last_stream_filtered if filtered else self._last_stream_unfiltered
+        elif filtered:
             value = self.getMostRecentFilteredCO2Measurement()
         else:
             value = self.getMostRecentUnfilteredCO2Measurement()
 
-        if value < 0 or type(value) != int: #To prevent CO2 agent from collapsing after treating occasional negative values
+        if value < 0: #To prevent CO2 agent from collapsing after treating occasional negative values
             return -1
-        else:
-            value = value * self.scalingFactor
+        value *= self.scalingFactor
 
-        if check_correction and self.PPMtoPercentage(value) > 1.0: # Concentration > 1.0 %
-                return self.correctMeasurement(value)
-        else:
-            return value
+        # Concentration > 1.0 %. Compared directly in ppm (1.0 % == 10000 ppm) rather than through
+        # PPMtoPercentage, which formats and re-parses the value on every reading
+        if value > 10000 and check_correction:
+            return self.correctMeasurement(value)
+        return value
 
 
     # Return the most recent filtered CO2 measurement in ppm
     # This value needs to be multiplied by the appropriate scaling factor to derive the ppm value.
     def getMostRecentFilteredCO2Measurement(self):
-        self.uart.write("Z\r\n")
+        self.uart.write(CMD_GET_FILT)
         result = self.UART_recv(timeout=self.timeout)
         if result is None:
             print("ERROR received when executing command getMostRecentFilteredCO2Measurement")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose and self.verbose_measuring:
+            if _VERBOSE_MEASURING and self.verbose and self.verbose_measuring:
                 print("getMostRecentFilteredCO2Measurement response: ", result)
-            return int(float(result[3:8]))
+            return int(result[3:8]) # Fixed-width ASCII digits, parsed straight from the reply bytes
 
     # Return the most recent unfiltered CO2 measurement in ppm
     # This value needs to be multiplied by the appropriate scaling factor to derive the ppm value.
     def getMostRecentUnfilteredCO2Measurement(self):
-        self.uart.write("z\r\n")
+        self.uart.write(CMD_GET_UNFILT)
         result = self.UART_recv(timeout=self.timeout)
         if result is None:
             print("ERROR received when executing command getMostRecentUnfilteredCO2Measurement")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose and self.verbose_measuring:
+            if _VERBOSE_MEASURING and self.verbose and self.verbose_measuring:
                 print("getMostRecentUnfilteredCO2Measurement response: ", result)
-            return int(float(result[3:8]))
+            return int(result[3:8]) # Fixed-width ASCII digits, parsed straight from the reply bytes
+
+    # Reads every byte pending on the UART at once and parses all the complete streaming mode (1) frames in it.
+    # Each frame carries both the filtered (Z) and unfiltered (z) values; the latest of each is cached for
+    # getCO2Measurement. Returns the list of filtered or unfiltered measurements found, oldest first. As with the
+    # Z and z commands, values still need to be multiplied by the scaling factor. Incomplete frames are kept until the next call
+    def drain_measurements(self, filtered=True):
+        n = self.uart.any()
+        if n:
+            self._rx += self.uart.read(n)
+        rx = self._rx # bytes, so find() and int() work on it with every MicroPython port
+
+        filtered_values = []
+        unfiltered_values = []
+        start = 0
+        end = rx.find(b"\r\n")
+        while end >= 0:
+            try:
+                i = rx.find(b" Z ", start, end)
+                if i >= 0:
+                    filtered_values.append(int(rx[i + 3:i + 8]))
+                i = rx.find(b" z ", start, end)
+                if i >= 0:
+                    unfiltered_values.append(int(rx[i + 3:i + 8]))
+            except ValueError: # Truncated frame, e.g. the first one received after switching mode
+                pass
+            start = end + 2
+            end = rx.find(b"\r\n", start)
+
+        if start:
+            self._rx = rx[start:]
+        elif len(rx) > _RX_MAX_PENDING: # No delimiter in several frames worth of bytes, drop the garbage
+            self._rx = b""
+
+        if filtered_values or unfiltered_values:
+            self._last_stream_ticks = time.ticks_ms()
+        if filtered_values:
+            self._last_stream_filtered = filtered_values[-1]
+        if unfiltered_values:
+            self._last_stream_unfiltered = unfiltered_values[-1]
+
+        if _VERBOSE_MEASURING and self.verbose and self.verbose_measuring:
+            print("drain_measurements parsed ", len(filtered_values), " filtered and ", len(unfiltered_values), " unfiltered values")
+        return filtered_values if filtered else unfiltered_values
 
     def PPMtoPercentage(self, value):
         if value is None or value < 0:
@@ -124,13 +214,19 @@ class sprintIRR20:
 
     # Correction made for concentrations > 1%
     def correctMeasurement(self, value):
+        delta = self._pressure_delta
         if value >= 1500:
-            Y = 2.6661 * math.pow(10,-16) * math.pow(value,4) - 1.1146 * math.pow(10,-12) * math.pow(value,3) + 1.7397 * math.pow(10,-9) * math.pow(value,2) - 1.2556 * math.pow(10,-6) * value - 9.8754 * math.pow(10,-4)
+            coefficients = _C_HI
         else:
-            Y = 2.881 * math.pow(10,-38) * math.pow(value,6) - 9.817 * math.pow(10,-32) * math.pow(value,5) + 1.304 * math.pow(10,-25) * math.pow(value,4) - 8.126 * math.pow(10,-20) * math.pow(value,3) + 2.311 * math.pow(10,-14) * math.pow(value,2) - 2.195 * math.pow(10,-9) * value - 1.471 * math.pow(10,-3)
+            coefficients = _C_LO
 
-        value_after = int(value / (1 + Y * (1013 - self.pressure)))
-        print("before:", str(value), ", after:", str(value_after))
+        Y = 0.0
+        for c in coefficients:
+            Y = Y * value + c
+
+        value_after = int(value / (1.0 + Y * delta))
+        if _VERBOSE_MEASURING and self.verbose and self.verbose_measuring:
+            print("before:", str(value), ", after:", str(value_after))
         return value_after
 
 ########################### DIGITAL FILTERS SETTINGS ###########################
@@ -158,27 +254,26 @@ class sprintIRR20:
             print("ERROR: value must be set between 0 and 65635")
             return -1
 
-        value_str = hp.formatArgument5digits(value)
-        command = "A " + value_str + "\r\n"
+        command = b"A %05d\r\n" % int(value)
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result != command:
             print("ERROR received when executing command setDigitalFilter")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
-                print("Set digital filter command has just been sent with response: ", result)
+            if _VERBOSE and self.verbose:
+                print("Set digital filter command has just been sent with response: ", result.decode())
             return 0
 
     # Return the value of the digital filter
     def getDigitalFilter(self):
-        self.uart.write("a\r\n")
+        self.uart.write(CMD_GET_FILTER)
         result = self.UART_recv(timeout=self.timeout)[3:8]
         if result is None:
             print("ERROR received when executing command getDigitalFilter")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Get digital filter command has just been sent with result: ", result)
             return int(result)
 
@@ -203,42 +298,42 @@ class sprintIRR20:
             print("ERROR: values must be positive")
             return -1
 
-        known_reading = int(known_reading / self.scalingFactor)
-        known_concentration = int(known_concentration / self.scalingFactor)
-        command = "F " + str(known_reading) + " " + str(known_concentration) + "\r\n"
+        known_reading = int(known_reading * self._inv_scaling)
+        known_concentration = int(known_concentration * self._inv_scaling)
+        command = b"F %d %d\r\n" % (known_reading, known_concentration)
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result is None: # responded with multiple values
             print("ERROR received when executing command fineTuneZeroPoint")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
-                print("Fine tune zero point command has just been sent with knownReading = ", known_reading, " and KnownConcentration = ", known_concentration, ". Response: ", result)
+            if _VERBOSE and self.verbose:
+                print("Fine tune zero point command has just been sent with knownReading = ", known_reading, " and KnownConcentration = ", known_concentration, ". Response: ", result.decode())
             return 0
 
     # Zero-point setting using fresh air.
     # The concentration value written to the sensor must be scaled dependent on the sensor CO2 measurement range.
     # The sensor can use the default fresh air CO2 concentration value (400ppm), or the user can write a different fresh air value to the sensor if desired (P command).
     def zeroPointFreshAir(self):
-        self.uart.write("G\r\n")
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        self.uart.write(CMD_ZERO_AIR)
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result is None:
             print("ERROR received when executing command zeroPointFreshAir")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
-                print("Zero point using fresh air command has just been sent with response: ", result)
+            if _VERBOSE and self.verbose:
+                print("Zero point using fresh air command has just been sent with response: ", result.decode())
             return 0
 
     # Zero-point setting using nitrogen assuming the sensor is in a 0 CO2 ppm environment
     def zeroPointNitrogen(self):
-        self.uart.write("U\r\n")
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        self.uart.write(CMD_ZERO_N2)
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result is None: # Responded with G 32662
             print("ERROR received when executing command zeroPointNitrogen")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Zero point using nitrogen command has just been sent")
             return 0
 
@@ -247,16 +342,15 @@ class sprintIRR20:
         if value is None or not hp.positive(value):
             print("ERROR: value must be positive")
             return -1
-        value = value/self.scalingFactor
-        value_str = hp.formatArgument5digits(value)
-        command = "u " + value_str + "\r\n"
+        value = int(value * self._inv_scaling)
+        command = b"u %05d\r\n" % value
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result != command:
             print("ERROR received when executing command zeroPointManualSetting")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Zero point using manual setting command has just been sent")
             return 0
 
@@ -266,16 +360,15 @@ class sprintIRR20:
             print("ERROR: value must be positive")
             return -1
 
-        value = value/self.scalingFactor
-        value_str = hp.formatArgument5digits(value)
-        command = "X " + value_str + "\r\n"
+        value = int(value * self._inv_scaling)
+        command = b"X %05d\r\n" % value
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode() # responded with X 35548
+        result = self.UART_recv(timeout=self.timeout)[1:] # responded with X 35548
         if result == None:
             print("ERROR received when executing command zeroPointKnownGas")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Zero point known gas command has just been sent")
             return 0
 
@@ -285,68 +378,48 @@ class sprintIRR20:
 #Example: convert 400 to two-byte word:
     # MSB = Integer(400/256)
     # LSB = 400 - (256*MSB)
+# which is the same as MSB = 400 >> 8 and LSB = 400 & 0xFF
+
+    # Parameter registers (MSB, LSB) holding the two-byte background concentrations
+    _REG_BACKGROUND_AUTOZEROING = (8, 9)
+    _REG_BACKGROUND_FRESH_AIR = (10, 11)
 
     # Sets value of CO2 background concentration in ppm for auto-zeroing. Input value is scaled by CO2 value multiplier
     def setBackgroundPPMAutozeroing(self, value):
-        if value is None or not hp.positive(value):
-            print("ERROR: value must be positive")
-            return -1
-
-        value = value/self.scalingFactor
-        msb = int(value/256)
-        lsb = int(value - (256*msb))
-        msb_str = hp.formatArgument5digits(msb)
-        lsb_str = hp.formatArgument5digits(lsb)
-
-        command_msb = "P 00008 " + msb_str + "\r\n"
-        command_lsb = "P 00009 " + lsb_str + "\r\n"
-
-        self.uart.write(command_msb)
-        result_msb = self.UART_recv(timeout=self.timeout)[1:].decode()
-        if result_msb != command_msb:
-            print("ERROR received when executing command setBackgroundPPMAutozeroing")
-            raise SprintIRR20_unexpected_reply()
-        else:
-            self.uart.write(command_lsb)
-            result_lsb = self.UART_recv(timeout=self.timeout)[9:14].decode()
-            if result_lsb != command_lsb:
-                print("ERROR received when executing command setBackgroundPPMAutozeroing")
-                raise SprintIRR20_unexpected_reply()
-            else:
-                if self.verbose:
-                    print("Background for auto-zeroing command has just been sent with response: ", result_msb[:-2], " ", result_lsb[:-2])
-                return 0
-
+        return self._write_two_byte_reg(self._REG_BACKGROUND_AUTOZEROING, value, "setBackgroundPPMAutozeroing")
 
     # Sets value of CO2 background concentration in ppm used for zero-point setting in fresh air. Input value is scaled by CO2 value multiplier
     def setBackgroundPPMFreshAir(self, value):
+        return self._write_two_byte_reg(self._REG_BACKGROUND_FRESH_AIR, value, "setBackgroundPPMFreshAir")
+
+    # Writes a scaled ppm value to a pair of (MSB, LSB) parameter registers using the P command
+    def _write_two_byte_reg(self, registers, value, name):
         if value is None or not hp.positive(value):
             print("ERROR: value must be positive")
             return -1
 
-        value = value/self.scalingFactor
-        msb = int(value/256)
-        lsb = int(value - (256*msb))
-        msb_str = hp.formatArgument5digits(msb)
-        lsb_str = hp.formatArgument5digits(lsb)
+        value = int(value * self._inv_scaling)
+        msb = value >> 8
+        lsb = value & 0xFF
+        reg_msb, reg_lsb = registers
 
-        command_msb = "P 00010 " + msb_str + "\r\n"
-        command_lsb = "P 00011 " + lsb_str + "\r\n"
+        command_msb = b"P %05d %05d\r\n" % (reg_msb, msb)
+        command_lsb = b"P %05d %05d\r\n" % (reg_lsb, lsb)
 
         self.uart.write(command_msb)
-        result_msb = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result_msb = self.UART_recv(timeout=self.timeout)[1:]
         if result_msb != command_msb:
-            print("ERROR received when executing command setBackgroundPPMFreshAir")
+            print("ERROR received when executing command " + name)
             raise SprintIRR20_unexpected_reply()
         else:
             self.uart.write(command_lsb)
-            result_lsb = self.UART_recv(timeout=self.timeout)[1:].decode()
+            result_lsb = self.UART_recv(timeout=self.timeout)[1:]
             if result_lsb != command_lsb:
-                print("ERROR received when executing command setBackgroundPPMFreshAir")
+                print("ERROR received when executing command " + name)
                 raise SprintIRR20_unexpected_reply()
             else:
-                if self.verbose:
-                    print("Background for auto-zeroing in fresh air command has just been sent with response: ", result_msb[:-2], " ", result_lsb[:-2])
+                if _VERBOSE and self.verbose:
+                    print(name + " command has just been sent with response: ", result_msb[:-2].decode(), " ", result_lsb[:-2].decode())
                 return 0
 
 ########################### MODE SETTINGS ###########################
@@ -374,14 +447,20 @@ class sprintIRR20:
     # Switch operation mode from command (0), streaming (1) and polling (2)
     def switchMode(self, mode):
         if mode in [0,1,2]:
-            command = "K 0000" + str(mode) + "\r\n"
+            command = CMD_MODES[mode]
             self.uart.write(command)
-            result = self.UART_recv(timeout=self.timeout)[1:].decode()
+            result = self.UART_recv(timeout=self.timeout)[1:]
             if result != command:
                 print("ERROR received when executing command switchMode")
                 raise SprintIRR20_unexpected_reply()
             else:
-                if self.verbose:
+                if mode != self.mode: # Don't carry frames or values from a previous streaming session to the next one
+                    self._rx = b""
+                    self._last_stream_filtered = -1
+                    self._last_stream_unfiltered = -1
+                    self._last_stream_ticks = time.ticks_ms() # The timeout counts from the start of the session
+                self.mode = mode
+                if _VERBOSE and self.verbose:
                     print("Mode switched to " + str(mode))
                 return 0
         else:
@@ -409,17 +488,24 @@ class sprintIRR20:
 
     def altitudeToPressure(self, altitude):
         if altitude != None and altitude > 0:
-            return 1013.25 * math.pow((1-0.0000225577 * altitude),5.25)
+            b = 1 - 0.0000225577 * altitude
+            if b <= 0:
+                print("ERROR: altitude out of range")
+                return -1
+            # b^5.25 = b^5 * b^(1/4), avoiding math.pow with a fractional exponent
+            b2 = b * b
+            b4 = b2 * b2
+            return 1013.25 * b4 * b * math.sqrt(math.sqrt(b))
         else:
             print("ERROR: value must be positive")
             return -1
 
     def pressureToCompensation(self, pressure): # Pressure in mbar
-        return int(8192 + ((1013 - pressure) * 0.14 / 100) * 8192)
+        return int(8192 + (_CALIBRATION_PRESSURE - pressure) * _COMPENSATION_PER_MBAR)
 
 
     def compensationToPressure(self, compensation):
-        return int((((compensation - 8192) * 100)/8192 - (1013*0.14)/0.14) * -1)
+        return int(_CALIBRATION_PRESSURE - (compensation - 8192) / _COMPENSATION_PER_MBAR)
 
 
     # Sets the pressure and concentration compensation value
@@ -428,29 +514,29 @@ class sprintIRR20:
             print("ERROR: value must be positive")
             return -1
 
-        value_str = hp.formatArgument5digits(value)
-        command = "S " + value_str + "\r\n"
+        command = b"S %05d\r\n" % int(value)
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result != command:
             print("ERROR received when executing command setPressureAndCompensationValue")
             raise SprintIRR20_unexpected_reply()
         else:
             self.compensationValue = int(value)
-            if self.verbose:
+            self.pressure = self.compensationToPressure(self.compensationValue)
+            self._pressure_delta = _CALIBRATION_PRESSURE - self.pressure
+            if _VERBOSE and self.verbose:
                 print("Set compensation value command has just been sent")
             return 0
 
     # Returns the pressure and concentration compensation value
     def getPressureAndCompensationValue(self):
-        command = "s\r\n"
-        self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[3:8].decode()
+        self.uart.write(CMD_GET_COMP)
+        result = self.UART_recv(timeout=self.timeout)[3:8]
         if result is None or int(result) < 0:
             print("ERROR received when executing command getPressureAndCompensatioValue")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Get compensation value command has just been sent")
             return int(result)
 
@@ -478,49 +564,48 @@ class sprintIRR20:
             print("ERROR: values must be set between 0 and 9")
             return -1
 
-        command = "@ " + str(initial) + ".0 " + str(regular) + ".0\r\n"
+        command = b"@ %d.0 %d.0\r\n" % (initial, regular)
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result != command:
             print("ERROR received when executing command setInitialAndIntervalAutoZeroing")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Set auto zeroing interval values command has just been sent")
             return 0
 
     # Returns the auto-zeroing configuration.
     # DOES NOT RETURN DUE VALUES
     def getAutoZeroingConfiguration(self):
-        command = "@ \r\n"
-        self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        self.uart.write(CMD_GET_AUTOZERO)
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result is None:
             print("ERROR received when executing command getAutoZeroingConfiguration")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
-                if result == "@ 0\r\n":
+            if _VERBOSE and self.verbose:
+                if result == b"@ 0\r\n":
                     print("Auto-zeroing is disabled and there is no configuration")
                 else:
-                    print("Auto-zeroing configuration: ", result)
+                    print("Auto-zeroing configuration: ", result.decode())
             return 0
 
 
     # Switch Auto-zeroing on or off. Default is off.
     def switchAutoZeroing(self, value=True):
         if value:
-            command = "@ 1\r\n"
+            command = CMD_AUTOZERO_ON
         else:
-            command = "@ 0\r\n"
+            command = CMD_AUTOZERO_OFF
 
         self.uart.write(command)
-        result = self.UART_recv(timeout=self.timeout)[1:].decode()
+        result = self.UART_recv(timeout=self.timeout)[1:]
         if result != command:
             print("ERROR received whem executing command SwitchAutoZeroing")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 if value:
                     print("Auto-zering has just been enabled")
                 else:
@@ -532,14 +617,14 @@ class sprintIRR20:
     # Returns the scaling factor multiplier required to convert the Z or z output to ppm
     # The multiplier must also be used when sending CO2 concentration levels to the sensor, for example when setting the fresh air CO2 concentration value.
     def getScalingFactorMultiplier(self):
-        self.uart.write(".\r\n")
-        result = self.UART_recv(timeout=self.timeout)[3:8].decode()
+        self.uart.write(CMD_SCALING)
+        result = self.UART_recv(timeout=self.timeout)[3:8]
         if result is None:
             print("ERROR received when executing command getScalingFactorMultiplier")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
-                print("Get scaling factor command has just been sent with response: ", result)
+            if _VERBOSE and self.verbose:
+                print("Get scaling factor command has just been sent with response: ", result.decode())
             return int(result)
 
     # Return firmware version and sensor serial number
@@ -547,14 +632,14 @@ class sprintIRR20:
         # Y,Aug 25 2021,14:19:56 - > firmware compile date and time LP15132 -> firmware version
         # B 528148 -> serial number, 00000
     def getFirmwareAndSerial(self):
-        self.uart.write("Y\r\n")
+        self.uart.write(CMD_FW)
         firmware = self.UART_recv(timeout=self.timeout).decode()
         serial = self.UART_recv(timeout=self.timeout).decode()
         if firmware is None or serial is None:
             print("ERROR received when executing command getFirmwareAndSerial")
             raise SprintIRR20_unexpected_reply()
         else:
-            if self.verbose:
+            if _VERBOSE and self.verbose:
                 print("Get firmware and serial information command has just been sent")
             return firmware, serial
 
@@ -562,28 +647,24 @@ class sprintIRR20:
         return self.UART_recv(timeout=self.timeout)[1:2].decode()
 
     def UART_recv(self, timeout=0):
-        counter = 0
         if timeout != 0: # Timeout specified
-            timeout_iters = 16 * timeout # aprox rate is 16 reads per second, so multiply seconds by 16 to establish timeout
-            for counter in range(timeout_iters):
-                response = self.uart.readline()
-                if response is None:
-                    continue
-                else:
+            deadline = time.ticks_add(time.ticks_ms(), int(timeout * 1000))
+            while time.ticks_diff(deadline, time.ticks_ms()) > 0:
+                # Only call readline when bytes are pending, so empty polls don't block for timeout_chars
+                response = self.uart.readline() if self.uart.any() else None
+                if response:
                     # Uncomment this code if you want to reset mode 0 because of messages flooding
                     # if self.getMessageType() != "K":
                     #     continue
-                    break
-            if response is None:
-                raise SprintIRR20_timeout()
-            return response
+                    return response
+                time.sleep_ms(5) # Sensor outputs at ~50 Hz, no need to spin faster than that
+            raise SprintIRR20_timeout()
 
         else: # No timeout
             while True:
-                response = self.uart.readline()
-                if response is None:
-                    counter += 1
-                    print(counter)
+                response = self.uart.readline() if self.uart.any() else None
+                if not response:
+                    time.sleep_ms(1) # Avoid starving other tasks while waiting
                     continue
                 else:
                     # Uncomment this code if you want to reset mode 0 because of messages flooding